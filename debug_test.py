@@ -86,8 +86,13 @@ def test_worker_race_condition_simulation():
         # Create a category directory that multiple workers might try to create
         category_dir = downloads_path / "TestCategory"
         
-        # Simulate multiple workers trying to create the same directory
+        # Simulate multiple workers trying to create the same directory.
+        # The barrier releases all threads at once so the mkdir calls actually race
+        # instead of being serialized by thread start-up time.
+        start_barrier = threading.Barrier(5)
+        
         def worker_create_dir():
+            start_barrier.wait()
             try:
                 category_dir.mkdir(exist_ok=True)
                 print(f"Thread {threading.current_thread().name} created directory")
@@ -139,25 +144,30 @@ def test_file_creation_during_sort():
         
         # Simulate the file completion wait logic
         prev_size = -1
-        max_attempts = 10
-        wait_seconds = 1
+        interval = 0.05
+        max_wait = 1
+        deadline = time.monotonic() + 10
+        attempt = 0
         
-        for attempt in range(max_attempts):
-            if not test_file.exists():
+        while True:
+            try:
+                current_size = os.stat(test_file).st_size
+            except FileNotFoundError:
                 print(f"File no longer exists at attempt {attempt}")
                 break
-                
-            current_size = test_file.stat().st_size
             print(f"Attempt {attempt}: Size = {current_size}, Prev = {prev_size}")
             
             if current_size == prev_size and current_size > 0:
                 print(f"File appears stable at attempt {attempt}")
                 break
+            if time.monotonic() >= deadline:
+                print("File never stabilized before the timeout")
+                break
                 
             prev_size = current_size
-            time.sleep(wait_seconds)
-        else:
-            print("File never stabilized after max attempts")
+            time.sleep(interval)
+            interval = min(interval * 2, max_wait)
+            attempt += 1
         
         modifier_thread.join()
 
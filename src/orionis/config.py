@@ -1,24 +1,72 @@
+import codecs
 import json
 import logging
 from pathlib import Path
 
+try:
+    # orjson is optional; it parses bytes directly and is much faster than the stdlib
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Used when config.json is missing or corrupt; frozensets keep the shared defaults immutable
+DEFAULT_FILE_CATEGORIES = {
+    'Images': frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.ico', '.tiff'}),
+    'Documents': frozenset({'.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.xls', '.xlsx', '.ppt', '.pptx'}),
+    'Videos': frozenset({'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp'}),
+    'Audio': frozenset({'.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'}),
+    'Archives': frozenset({'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz'}),
+    'Programs': frozenset({'.exe', '.msi', '.dmg', '.pkg', '.deb', '.rpm', '.appx'}),
+    'Code': frozenset({'.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go'}),
+    'Others': frozenset()
+}
+
 def load_configuration(config_path: Path):
     """Load configuration from config.json file."""
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-            logging.info("✓ Configuration successfully loaded from %s", config_path)
-            return config.get('file_categories', {})
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+        data = Path(config_path).read_bytes()
+        # Editors like Notepad may save a BOM, which orjson rejects
+        if data.startswith(codecs.BOM_UTF8):
+            data = data[len(codecs.BOM_UTF8):]
+        file_categories = _validate_categories(_json_loads(data))
+        logging.info("✓ Configuration successfully loaded from %s", config_path)
+        return normalize_categories(file_categories)
+    except (FileNotFoundError, ValueError) as e:
         logging.error("❌ Error loading %s: %s. Using default configuration.", config_path, e)
-        # Fallback to default configuration if file is missing or corrupt
-        return {
-            'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.ico', '.tiff'],
-            'Documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.xls', '.xlsx', '.ppt', '.pptx'],
-            'Videos': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp'],
-            'Audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a'],
-            'Archives': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz'],
-            'Programs': ['.exe', '.msi', '.dmg', '.pkg', '.deb', '.rpm', '.appx'],
-            'Code': ['.py', '.js', '.html', '.css', '.java', '.cpp', '.c', '.php', '.rb', '.go'],
-            'Others': []
-        }
+        # Fallback to default configuration if file is missing or corrupt;
+        # ValueError covers JSONDecodeError, a file that is not UTF-8 and a config of the wrong shape
+        return dict(DEFAULT_FILE_CATEGORIES)
+
+
+def _validate_categories(config) -> dict:
+    """Return the file_categories mapping, raising ValueError if the config has the wrong shape."""
+    if not isinstance(config, dict):
+        raise ValueError("config must be a JSON object")
+    file_categories = config.get('file_categories', {})
+    if not isinstance(file_categories, dict):
+        raise ValueError("'file_categories' must be an object")
+    for category, extensions in file_categories.items():
+        if not isinstance(extensions, list) or not all(isinstance(ext, str) for ext in extensions):
+            raise ValueError(f"extensions of category '{category}' must be a list of strings")
+    return file_categories
+
+
+def normalize_categories(file_categories: dict) -> dict:
+    """Convert each category's extensions to a lowercase frozenset for O(1) membership tests."""
+    return {
+        category: frozenset(extension.lower() for extension in extensions)
+        for category, extensions in file_categories.items()
+    }
+
+
+def build_extension_index(file_categories: dict) -> dict:
+    """
+    Build a lowercase extension -> category lookup from the category configuration.
+    When an extension is listed under several categories, the first one wins.
+    """
+    index = {}
+    for category, extensions in file_categories.items():
+        for extension in extensions:
+            index.setdefault(extension.lower(), category)
+    return index
@@ -1,52 +1,50 @@
+import atexit
 import logging
 import queue
 import signal
 import sys
 import threading
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemMovedEvent
+from watchdog.events import FileClosedEvent, FileCreatedEvent, FileMovedEvent
 
 from .config import load_configuration
+from .queues import LightQueue
 from .sorter import FileSorter
 from .tray import SystemTrayIcon
+from .watcher import WatcherEventHandler
 
 # Constants
 LOG_FILE = "orionis_auto_sort.log"
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 3
 APP_NAME = "Orionis Auto Sort"
-
-class WatcherEventHandler(FileSystemEventHandler):
-    """A watchdog event handler that puts new file paths into a queue."""
-    def __init__(self, work_queue: queue.Queue, download_path: Path):
-        self.work_queue = work_queue
-        self.download_path = download_path
-
-    def on_created(self, event):
-        if not event.is_directory:
-            logging.info("📥 New file detected: %s", event.src_path)
-            self.work_queue.put(Path(event.src_path))
-
-    def on_moved(self, event: FileSystemMovedEvent):
-        if not event.is_directory and Path(event.dest_path).parent == self.download_path:
-            logging.info("📥 File moved into downloads: %s", event.dest_path)
-            self.work_queue.put(Path(event.dest_path))
-
+# Resolved once at import; holds config.json and icon.png when running from source
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
 def setup_logging():
-    """Set up file-based logging."""
+    """
+    Set up file-based logging.
+    Log calls format the message and enqueue the record; a listener thread does the
+    disk and console writes, so workers never block on I/O.
+    """
     log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     log_handler = RotatingFileHandler(LOG_FILE, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
     log_handler.setFormatter(log_formatter)
-    
+    # Also log to console for debugging
+    console_handler = logging.StreamHandler()
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, log_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued when the process exits, on every exit path
+    atexit.register(listener.stop)
+
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(log_handler)
-    # Also log to console for debugging
-    root_logger.addHandler(logging.StreamHandler())
+    root_logger.addHandler(QueueHandler(log_queue))
 
 
 def main():
@@ -66,21 +64,16 @@ def main():
             # In a one-file bundle, resources are in a temporary folder _MEIPASS
             base_path = Path(sys._MEIPASS)
         else:  # Running as script
-            base_path = Path(__file__).parent.parent.parent
+            base_path = PROJECT_ROOT
 
         config_path = base_path / 'config.json'
-        if not config_path.exists():
-            config_path = Path(__file__).parent.parent.parent / 'config.json'
-        
         icon_path = base_path / 'icon.png'
-        if not icon_path.exists():
-            icon_path = Path(__file__).parent.parent.parent / 'icon.png'
 
         # Fallback to script location if not found in base path
         if not config_path.exists():
-            config_path = Path(__file__).parent.parent.parent / 'config.json'
+            config_path = PROJECT_ROOT / 'config.json'
         if not icon_path.exists():
-            icon_path = Path(__file__).parent.parent.parent / 'icon.png'
+            icon_path = PROJECT_ROOT / 'icon.png'
 
     except Exception as e:
         logging.error("❌ Error determining resource paths: %s", e)
@@ -100,8 +93,8 @@ def main():
 
     # --- Setup Communication Channels ---
     stop_event = threading.Event()
-    work_queue = queue.Queue()
-    status_queue = queue.Queue()
+    work_queue = LightQueue()
+    status_queue = LightQueue()
 
     # --- Load Configuration ---
     file_categories = load_configuration(config_path)
@@ -109,9 +102,16 @@ def main():
     # --- Setup Core Components ---
     file_sorter = FileSorter(work_queue, status_queue, downloads_path, file_categories, stop_event)
     
-    event_handler = WatcherEventHandler(work_queue, downloads_path)
+    event_handler = WatcherEventHandler(file_sorter.enqueue, downloads_path, stop_event)
     observer = Observer()
-    observer.schedule(event_handler, str(downloads_path), recursive=False)
+    # Only subscribe to the events the handler uses; on Linux this narrows the inotify
+    # mask so modify/attrib/access events from active downloads never reach Python
+    observer.schedule(
+        event_handler,
+        str(downloads_path),
+        recursive=False,
+        event_filter=[FileCreatedEvent, FileMovedEvent, FileClosedEvent],
+    )
 
     tray_icon = SystemTrayIcon(APP_NAME, icon_path, status_queue, stop_event, downloads_path)
 
@@ -130,6 +130,7 @@ def main():
         
         # Start all background components
         observer.start()
+        event_handler.start()
         file_sorter.start()
         
         # Perform initial sort of existing files
@@ -145,10 +146,14 @@ def main():
     finally:
         # --- Graceful Shutdown ---
         logging.info("🛑 Shutting down application...")
+        # Already set on a normal exit, but not when the tray loop raised;
+        # the debounce thread and the workers rely on it to stop promptly
+        stop_event.set()
         if observer.is_alive():
             observer.stop()
             observer.join(timeout=2)
         
+        event_handler.stop()
         file_sorter.stop()
         
         # The tray_icon.run() call blocks until it's stopped,
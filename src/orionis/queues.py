@@ -0,0 +1,65 @@
+"""
+Lightweight work queue used between the watcher, the sorter workers and the tray
+"""
+import collections
+import queue
+import threading
+import time
+
+
+class LightQueue:
+    """
+    A minimal FIFO queue with the subset of the queue.Queue API the application uses.
+    put() is a deque append plus an Event.set(), with no lock of its own.
+    task_done() is a no-op and join() is not supported.
+    """
+
+    def __init__(self):
+        self._items = collections.deque()  # append/popleft are atomic
+        self._not_empty = threading.Event()
+
+    def put(self, item):
+        """Add an item and wake any waiting consumer."""
+        self._items.append(item)
+        self._not_empty.set()
+
+    def get(self, block: bool = True, timeout: float = None):
+        """Remove and return the oldest item, raising queue.Empty if none arrives in time."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+            if not block:
+                raise queue.Empty
+
+            # Clear, then look again, so an item put between the failed pop
+            # and the clear still leaves the event set for the wait below
+            self._not_empty.clear()
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+
+            if deadline is None:
+                self._not_empty.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._not_empty.wait(remaining):
+                    raise queue.Empty
+
+    def get_nowait(self):
+        """Remove and return the oldest item without waiting."""
+        return self.get(block=False)
+
+    def task_done(self):
+        """Kept for queue.Queue compatibility; nothing waits on completed tasks."""
+
+    def qsize(self) -> int:
+        """Return the approximate number of queued items."""
+        return len(self._items)
+
+    def empty(self) -> bool:
+        """Return True if the queue is currently empty."""
+        return not self._items
@@ -1,29 +1,89 @@
 """
 Improved File Sorter module with enhanced security and error handling
 """
+import errno
+import functools
 import logging
+import os
+import re
 import shutil
+import stat
 import threading
 import time
 import queue
+from collections import OrderedDict
 from pathlib import Path
 
-STABLE_FILE_WAIT_SECONDS = 1
-STABLE_FILE_MAX_ATTEMPTS = 10
-NUM_WORKERS = 4  # Number of concurrent worker threads
+from .config import build_extension_index, normalize_categories
 
+logger = logging.getLogger(__name__)
 
-def safe_path_join(base_path: Path, *additional_parts) -> Path:
+STABLE_FILE_POLL_INTERVAL = 0.05  # First gap between size samples, doubled after each change
+STABLE_FILE_WAIT_SECONDS = 1  # Upper bound for the gap between size samples
+STABLE_FILE_TIMEOUT_SECONDS = 10
+IDLE_FILE_AGE_SECONDS = STABLE_FILE_WAIT_SECONDS * 2  # Files unmodified this long skip the wait
+COPY_CHUNK_SIZE = 0x7ffff000  # Largest count Linux transfers in one copy call
+# copy_file_range errors meaning "not possible here" rather than a real I/O failure
+_COPY_FILE_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM}
+# Workers mostly wait on disk I/O and file stability checks, so use more threads than cores
+NUM_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+MAX_NAME_COUNTERS = 256  # Numbering counters kept for the most recently colliding names
+
+
+# Browsers write downloads under these names and rename them once complete
+TEMP_DOWNLOAD_SUFFIXES = ('.crdownload', '.part', '.partial', '.download', '.opdownload', '.tmp')
+
+
+def is_temporary_download(filename: str) -> bool:
+    """Return True for files that are still being downloaded under a temporary name."""
+    return filename.lower().endswith(TEMP_DOWNLOAD_SUFFIXES)
+
+
+def _is_plain_name(part) -> bool:
+    """Return True if part is a single path component with no separators or drive."""
+    return (
+        isinstance(part, str)
+        and part not in ('', '.', '..')
+        and '/' not in part
+        and '\\' not in part
+        and not os.path.splitdrive(part)[0]
+    )
+
+
+def _is_link(path) -> bool:
+    """
+    Return True if path is a symlink or any other reparse point, such as an NTFS junction.
+    os.path.islink misses junctions before Python 3.12. Errors other than a missing
+    path count as a link, so the caller falls back to the full resolve().
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return True
+    if stat.S_ISLNK(st.st_mode):
+        return True
+    # st_file_attributes only exists on Windows
+    return bool(getattr(st, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def safe_path_join(base_resolved: Path, *additional_parts) -> Path:
     """
     Safely join path parts, preventing path traversal.
     Ensures the final path stays within the base directory.
+    The base must already be resolved; callers resolve it once instead of on every join.
     """
     # Convert to Path objects and join them
-    result = base_path.joinpath(*additional_parts)
-    
-    # Resolve the path and ensure it's within base_path
+    result = base_resolved.joinpath(*additional_parts)
+
+    # Fast path: a single plain name that is not a link cannot leave the base,
+    # so one lstat replaces the full resolve()
+    if len(additional_parts) == 1 and _is_plain_name(additional_parts[0]) and not _is_link(result):
+        return result
+
+    # Resolve the path and ensure it's within the base path
     resolved = result.resolve()
-    base_resolved = base_path.resolve()
     
     try:
         # Check if the resolved path is within the base path
@@ -31,148 +91,392 @@ def safe_path_join(base_path: Path, *additional_parts) -> Path:
         return resolved
     except ValueError:
         # Path traversal detected - return base path only
-        logging.warning("⚠️ Path traversal attempt detected: %s", result)
+        logger.warning("⚠️ Path traversal attempt detected: %s", result)
         raise ValueError(f"Path traversal detected: {result}")
 
 
+def move_file(source: str, destination: str):
+    """
+    Move a file to its destination.
+    Uses a single atomic rename; only a move across filesystems copies the data.
+    """
+    try:
+        os.replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        try:
+            _copy_file(source, destination)
+        except OSError:
+            # Do not leave a truncated copy behind
+            if os.path.exists(destination):
+                os.unlink(destination)
+            raise
+        os.unlink(source)
+
+
+def _copy_file(source: str, destination: str):
+    """Copy file data and metadata; copyfile uses the OS zero-copy primitives where available."""
+    if not (hasattr(os, 'copy_file_range') and _copy_file_range(source, destination)):
+        shutil.copyfile(source, destination)
+    shutil.copystat(source, destination)
+
+
+def _copy_file_range(source: str, destination: str) -> bool:
+    """
+    Copy file data inside the kernel with copy_file_range (Linux).
+    Returns False when the filesystems do not support it, so the caller can fall back.
+    """
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        copied_total = 0
+        while True:
+            try:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), COPY_CHUNK_SIZE)
+            except OSError as e:
+                if copied_total == 0 and e.errno in _COPY_FILE_RANGE_UNSUPPORTED:
+                    return False
+                raise
+            if copied == 0:
+                return True
+            copied_total += copied
+
+
+@functools.lru_cache(maxsize=256)
+def _numbered_name_pattern(stem: str, suffix: str) -> re.Pattern:
+    """Compile (once per stem and suffix) the pattern matching numbered copies of a name."""
+    return re.compile(re.escape(stem) + r'_(\d+)' + re.escape(suffix))
+
+
+class DestinationIndex:
+    """
+    Thread-safe cache of the file names present in each destination folder.
+    Lets workers pick collision-free names with set lookups instead of
+    probing the filesystem once per candidate.
+    """
+
+    def __init__(self):
+        self._names = {}
+        # (folder, stem, suffix) -> last number handed out, least recently used first
+        self._counters = OrderedDict()
+        self._folder_locks = {}
+        self._lock = threading.Lock()  # Guards the per-folder lock map and the shared counters
+
+    def _folder_lock(self, key: str) -> threading.Lock:
+        """Return the lock for a folder, so moves into different folders never wait on each other."""
+        with self._lock:
+            lock = self._folder_locks.get(key)
+            if lock is None:
+                lock = self._folder_locks[key] = threading.Lock()
+            return lock
+
+    def _folder_names(self, key: str) -> set:
+        """Return the cached name set for a folder, scanning it on first use."""
+        names = self._names.get(key)
+        if names is None:
+            try:
+                with os.scandir(key) as entries:
+                    names = {entry.name for entry in entries}
+            except FileNotFoundError:
+                names = set()
+            self._names[key] = names
+        return names
+
+    def reserve(self, folder: Path, filename: str, stem: str, suffix: str,
+                create_placeholder: bool = False) -> str:
+        """
+        Pick a name that is free in the folder and mark it as taken.
+        With create_placeholder, the name is claimed on disk by creating an empty file
+        with O_CREAT|O_EXCL, so other processes cannot take it before the move.
+        """
+        key = str(folder)
+        with self._folder_lock(key):
+            names = self._folder_names(key)
+            candidate = filename
+            counter = None
+            while True:
+                if candidate not in names:
+                    # Only the chosen name hits the disk, to catch files created behind our back
+                    if self._is_free(os.path.join(key, candidate), create_placeholder):
+                        break
+                    names.add(candidate)
+                elif create_placeholder and self._is_free(os.path.join(key, candidate), True):
+                    # The cached name is stale, e.g. a sorted file was deleted since.
+                    # Without placeholders the cache also holds pending reservations
+                    # that are not on disk yet, so it is trusted as is.
+                    break
+                if counter is None:
+                    # Continue after the highest number already used instead of probing from 1
+                    counter = self._get_counter((key, stem, suffix))
+                    if counter is None:
+                        counter = self._highest_number(names, stem, suffix)
+                counter += 1
+                candidate = f"{stem}_{counter}{suffix}"
+            if counter is not None:
+                self._set_counter((key, stem, suffix), counter)
+            names.add(candidate)
+            return candidate
+
+    def _get_counter(self, counter_key: tuple):
+        """Return the last number handed out for a name, or None if it is not cached."""
+        with self._lock:
+            counter = self._counters.get(counter_key)
+            if counter is not None:
+                self._counters.move_to_end(counter_key)
+            return counter
+
+    def _set_counter(self, counter_key: tuple, counter: int):
+        """Remember the last number for a name, evicting the least recently used beyond the cap."""
+        with self._lock:
+            self._counters[counter_key] = counter
+            self._counters.move_to_end(counter_key)
+            if len(self._counters) > MAX_NAME_COUNTERS:
+                self._counters.popitem(last=False)
+
+    @staticmethod
+    def _is_free(path: str, create_placeholder: bool) -> bool:
+        """Return True if nothing exists at path, claiming it when create_placeholder is set."""
+        if not create_placeholder:
+            return not os.path.lexists(path)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        os.close(fd)
+        return True
+
+    @staticmethod
+    def _highest_number(names: set, stem: str, suffix: str) -> int:
+        """Return the highest N among names of the form '<stem>_<N><suffix>', or 0."""
+        pattern = _numbered_name_pattern(stem, suffix)
+        return max((int(match.group(1)) for match in map(pattern.fullmatch, names) if match), default=0)
+
+
+def _queue_key(file_path) -> str:
+    """Key used to spot a path that is already waiting in the work queue."""
+    return os.path.normcase(os.fspath(file_path))
+
+
+class InFlightFiles:
+    """Thread-safe set of claimed files, e.g. those currently being processed by any worker."""
+
+    def __init__(self):
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def acquire(self, key) -> bool:
+        """Claim a file; returns False if another worker already holds it."""
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
+
+    def release(self, key):
+        """Give up the claim on a file."""
+        with self._lock:
+            self._keys.discard(key)
+
+
 class SortWorker(threading.Thread):
     """A worker thread that processes files from a queue with security enhancements."""
 
-    def __init__(self, work_queue: queue.Queue, status_queue: queue.Queue, download_path: Path, file_categories: dict, stop_event: threading.Event):
+    def __init__(self, work_queue: queue.Queue, status_queue: queue.Queue, download_path: Path, file_categories: dict, stop_event: threading.Event, destination_index: DestinationIndex = None, in_flight: InFlightFiles = None, ext_index: dict = None, queued: InFlightFiles = None):
         super().__init__(daemon=True)
         self.work_queue = work_queue
         self.status_queue = status_queue
         self.download_path = download_path.resolve()  # Ensure absolute path
+        self._download_prefix = os.path.normcase(os.path.join(self.download_path, ''))
         self.file_categories = file_categories
+        # FileSorter builds the index once for all workers; standalone workers build their own
+        self._ext_index = ext_index if ext_index is not None else build_extension_index(file_categories)
         self.stop_event = stop_event
+        self._category_folders = {}  # category -> validated destination folder
+        # Shared between workers so concurrent moves never pick the same name
+        self.destination_index = destination_index or DestinationIndex()
+        self.in_flight = in_flight or InFlightFiles()
+        self.queued = queued or InFlightFiles()  # Paths waiting in work_queue, see FileSorter.enqueue
 
     def run(self):
         """The main loop for the worker."""
-        while not self.stop_event.is_set():
-            try:
-                file_path = self.work_queue.get(timeout=1)
-                self._process_file(file_path)
+        while True:
+            # Blocks without waking up until work arrives; FileSorter.stop() sends None
+            file_path = self.work_queue.get()
+            if file_path is None:
                 self.work_queue.task_done()
-            except queue.Empty:
-                continue
+                break
+            # Released on dequeue, so events arriving while the file is processed can queue it again
+            self.queued.release(_queue_key(file_path))
+            try:
+                # Files still queued at shutdown are dropped instead of sorted
+                if not self.stop_event.is_set():
+                    self._process_file(file_path)
             except Exception as e:
-                logging.error("❌ Unexpected error in worker thread: %s", e, exc_info=True)
+                logger.error("❌ Unexpected error in worker thread: %s", e, exc_info=True)
+            finally:
+                # Always acknowledge the item so work_queue.join() cannot hang
+                self.work_queue.task_done()
 
     def _process_file(self, file_path: Path):
         """The core logic to process a single file with security checks."""
         try:
-            # Validate file path to ensure it's within downloads directory
-            try:
-                file_path = file_path.resolve()
-                file_path.relative_to(self.download_path)
-            except ValueError:
-                logging.error("❌ Security: File path is outside of download directory: %s", file_path)
-                return
-
-            if not file_path.exists() or not file_path.is_file():
-                logging.warning("⚠️ File no longer exists or is not a file: %s", file_path.name)
+            # Validate file path to ensure it's within downloads directory.
+            # Compared as normalized strings; pathlib's relative_to rebuilds both paths per file.
+            real_path = os.path.realpath(file_path)
+            if not os.path.normcase(real_path).startswith(self._download_prefix):
+                logger.error("❌ Security: File path is outside of download directory: %s", real_path)
                 return
+            file_path = Path(real_path)
 
-            if not self._wait_for_file_completion(file_path):
-                logging.warning("⚠️ File was not stable or disappeared: %s", file_path.name)
-                return
-
-            category = self._get_file_category(file_path.suffix)
-            
-            # Safely create destination folder path
+            # One stat call answers both "does it exist" and "is it a regular file"
             try:
-                destination_folder = safe_path_join(self.download_path, category)
-                destination_folder.mkdir(exist_ok=True)
-            except ValueError as e:
-                logging.error("❌ Security: Invalid destination path construction: %s", e)
+                file_stat = os.stat(file_path)
+            except FileNotFoundError:
+                file_stat = None
+            if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
+                logger.warning("⚠️ File no longer exists or is not a file: %s", file_path.name)
                 return
 
-            # Generate unique destination path safely
-            try:
-                destination_path = self._get_unique_destination(destination_folder, file_path.name)
-                # Further validate the destination path
-                destination_path.relative_to(self.download_path)
-            except ValueError as e:
-                logging.error("❌ Security: Invalid destination path: %s", e)
+            # Duplicate queue entries for a file already being handled are dropped.
+            # Keyed by file identity, so the same file queued under two names is caught too.
+            key = (file_stat.st_dev, file_stat.st_ino)
+            if not file_stat.st_ino:
+                key = str(file_path)  # Some network filesystems report no inode numbers
+            if not self.in_flight.acquire(key):
+                logger.info("⏭️ Already being processed: %s", file_path.name)
                 return
-
-            logging.info("⏳ Moving %s to %s/", file_path.name, category)
-            
-            # Move the file
-            shutil.move(str(file_path), str(destination_path))
-            logging.info("✅ Successfully moved %s → %s/", file_path.name, category)
-            self.status_queue.put({
-                'title': 'File Sorted',
-                'text': f'{file_path.name} was moved to {category}.'
-            })
+            try:
+                self._sort_file(file_path, file_stat)
+            finally:
+                self.in_flight.release(key)
 
         except (PermissionError, OSError) as e:
-            logging.error("❌ Permission/OS error moving %s: %s", file_path.name, e)
+            logger.error("❌ Permission/OS error moving %s: %s", file_path.name, e)
             self.status_queue.put({
                 'title': 'Move Error',
                 'text': f"Could not move {file_path.name}. Check permissions."
             })
         except Exception as e:
-            logging.error("❌ Unexpected error moving %s: %s", file_path.name, e, exc_info=True)
+            logger.error("❌ Unexpected error moving %s: %s", file_path.name, e, exc_info=True)
             self.status_queue.put({
                 'title': 'Move Error',
                 'text': f"An unexpected error occurred with {file_path.name}."
             })
 
-    def _wait_for_file_completion(self, file_path: Path) -> bool:
-        """Wait until a file's size is stable with timeout protection."""
-        if not file_path.exists():
-            return False
+    def _sort_file(self, file_path: Path, file_stat: os.stat_result):
+        """Move a validated file into its category folder."""
+        # Read the name once and reuse it for every check, log and message below
+        name = file_path.name
+
+        if name.startswith('.'):
+            return  # Hidden files are left in place, as in sort_existing_files
+
+        if not self._wait_for_file_completion(file_path, file_stat):
+            logger.warning("⚠️ File was not stable or disappeared: %s", name)
+            return
+
+        category = self._get_file_category(os.path.splitext(name)[1])
         
-        # For very small files, wait just a moment
+        # Safely create destination folder path
         try:
-            file_size = file_path.stat().st_size
-        except (FileNotFoundError, OSError):
-            return False
+            # Validate and build each category folder path once, not once per file
+            destination_folder = self._category_folders.get(category)
+            if destination_folder is None:
+                destination_folder = safe_path_join(self.download_path, category)
+                # Category folders are created at startup, so this is the only mkdir per folder
+                destination_folder.mkdir(exist_ok=True)
+                self._category_folders[category] = destination_folder
+        except ValueError as e:
+            logger.error("❌ Security: Invalid destination path construction: %s", e)
+            return
 
-        if file_size < 1024:
-            time.sleep(STABLE_FILE_WAIT_SECONDS)
-            return file_path.exists()
+        # Generate unique destination path safely
+        try:
+            # The chosen name is claimed with an empty placeholder that the move replaces
+            try:
+                destination_path = self._get_unique_destination(destination_folder, name, create_placeholder=True)
+            except FileNotFoundError:
+                # The category folder was removed while running; recreate it and retry once
+                destination_folder.mkdir(exist_ok=True)
+                destination_path = self._get_unique_destination(destination_folder, name, create_placeholder=True)
+        except ValueError as e:
+            logger.error("❌ Security: Invalid destination path: %s", e)
+            return
 
-        prev_size = -1
-        for attempt in range(STABLE_FILE_MAX_ATTEMPTS):
+        # Checked once for both per-file messages
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info("⏳ Moving %s to %s/", name, category)
+        
+        # Move the file
+        try:
+            move_file(str(file_path), str(destination_path))
+        except OSError:
+            # Don't leave the empty placeholder behind
             try:
-                if not file_path.exists():
-                    return False
-                current_size = file_path.stat().st_size
-                if current_size == prev_size and current_size > 0:
-                    return True
-                prev_size = current_size
-                time.sleep(STABLE_FILE_WAIT_SECONDS)
-            except (FileNotFoundError, OSError):
+                os.unlink(destination_path)
+            except FileNotFoundError:
+                pass
+            raise
+        if log_info:
+            logger.info("✅ Successfully moved %s → %s/", name, category)
+        self.status_queue.put({
+            'title': 'File Sorted',
+            'text': f'{name} was moved to {category}.'
+        })
+
+    def _wait_for_file_completion(self, file_path: Path, file_stat: os.stat_result = None) -> bool:
+        """
+        Wait until a file's size is stable with timeout protection.
+        A stat result the caller already has is used as the first size sample.
+        """
+        if file_stat is None:
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                return False
+
+        # A file nobody has written to for a while is finished, e.g. one that was
+        # already in the folder at startup, so it needs no second sample
+        if file_stat.st_size > 0 and time.time() - file_stat.st_mtime > IDLE_FILE_AGE_SECONDS:
+            return True
+
+        # Start with a short gap so finished files are picked up quickly,
+        # and back off while the file keeps growing
+        interval = STABLE_FILE_POLL_INTERVAL
+        deadline = time.monotonic() + STABLE_FILE_TIMEOUT_SECONDS
+        prev_size = file_stat.st_size
+        while True:
+            time.sleep(interval)
+            try:
+                current_size = os.stat(file_path).st_size
+            except OSError:
                 return False
-        return False  # File never stabilized
+            # Browsers such as Firefox create an empty file under the final name
+            # next to the .part file, so an empty file is never treated as finished
+            if current_size == prev_size and current_size > 0:
+                return True
+            if time.monotonic() >= deadline:
+                return False  # File never stabilized
+            prev_size = current_size
+            interval = min(interval * 2, STABLE_FILE_WAIT_SECONDS)
 
     def _get_file_category(self, file_extension: str) -> str:
         """Determine file category based on its extension."""
-        file_extension = file_extension.lower()
-        for category, extensions in self.file_categories.items():
-            if file_extension in extensions:
-                return category
-        return 'Others'
+        return self._ext_index.get(file_extension.lower(), 'Others')
 
-    def _get_unique_destination(self, destination_folder: Path, filename: str) -> Path:
+    def _get_unique_destination(self, destination_folder: Path, filename: str,
+                                create_placeholder: bool = False) -> Path:
         """Generate a unique file path if the destination already exists."""
         # Validate filename to prevent path traversal
         if '..' in filename or filename.startswith('/') or '../' in filename:
             raise ValueError(f"Invalid filename detected: {filename}")
         
-        destination_path = destination_folder / filename
-        counter = 1
-        while destination_path.exists():
-            stem = Path(filename).stem
-            suffix = Path(filename).suffix
-            # Sanitize stem to prevent path traversal in the middle
-            if '..' in stem or '/' in stem or '\\' in stem:
-                stem = ''.join(c for c in stem if c.isalnum() or c in (' ', '-', '_')).strip()
-            destination_path = destination_folder / f"{stem}_{counter}{suffix}"
-            counter += 1
-        return destination_path
+        stem, suffix = os.path.splitext(filename)
+        # Sanitize stem to prevent path traversal in the middle
+        if '..' in stem or '/' in stem or '\\' in stem:
+            stem = ''.join(c for c in stem if c.isalnum() or c in (' ', '-', '_')).strip()
+        return destination_folder / self.destination_index.reserve(
+            destination_folder, filename, stem, suffix, create_placeholder)
 
 
 class FileSorter:
@@ -182,20 +486,29 @@ class FileSorter:
         self.work_queue = work_queue
         self.status_queue = status_queue
         self.download_path = download_path.resolve()  # Ensure absolute path
-        self.file_categories = file_categories
+        # load_configuration already normalizes, but callers may pass plain lists
+        self.file_categories = normalize_categories(file_categories)
         self.stop_event = stop_event
+        self.destination_index = DestinationIndex()
+        self.in_flight = InFlightFiles()
+        self.queued = InFlightFiles()
+        self.ext_index = build_extension_index(self.file_categories)
         self.workers = []
 
     def start(self):
         """Start the worker threads."""
-        logging.info("🚀 Starting %d sorter workers...", NUM_WORKERS)
+        logger.info("🚀 Starting %d sorter workers...", NUM_WORKERS)
         for _ in range(NUM_WORKERS):
             worker = SortWorker(
                 self.work_queue,
                 self.status_queue,
                 self.download_path,
                 self.file_categories,
-                self.stop_event
+                self.stop_event,
+                self.destination_index,
+                self.in_flight,
+                self.ext_index,
+                self.queued
             )
             worker.start()
             self.workers.append(worker)
@@ -205,35 +518,54 @@ class FileSorter:
 
     def stop(self):
         """Stop all worker threads."""
-        logging.info("🛑 Stopping sorter workers...")
-        # The stop_event will signal workers to exit their loops
+        logger.info("🛑 Stopping sorter workers...")
+        # One sentinel per worker; each worker exits after taking one
+        for _ in self.workers:
+            self.work_queue.put(None)
         for worker in self.workers:
             if worker.is_alive():
                 worker.join(timeout=2)
 
     def _create_category_folders(self):
         """Create folders for each file category safely."""
+        # List the download folder once so existing categories cost no mkdir call;
+        # only directories count, the type comes from the listing itself
+        with os.scandir(self.download_path) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir(follow_symlinks=False)}
         for folder_name in self.file_categories.keys():
+            if folder_name in existing:
+                continue
             try:
                 folder_path = safe_path_join(self.download_path, folder_name)
                 folder_path.mkdir(exist_ok=True)
             except ValueError as e:
-                logging.error("❌ Security: Invalid category folder name: %s (%s)", folder_name, e)
+                logger.error("❌ Security: Invalid category folder name: %s (%s)", folder_name, e)
                 continue
 
+    def enqueue(self, file_path: Path) -> bool:
+        """
+        Queue a file for sorting unless it is already waiting in the queue.
+        Returns False for duplicates, e.g. a file found by the startup scan that the
+        watcher reports again before a worker has picked it up.
+        """
+        if not self.queued.acquire(_queue_key(file_path)):
+            return False
+        self.work_queue.put(file_path)
+        return True
+
     def sort_existing_files(self):
         """Add all existing files in the download path to the work queue."""
-        logging.info("🔄 Queueing existing files for sorting...")
+        logger.info("🔄 Queueing existing files for sorting...")
         count = 0
-        for file_path in self.download_path.iterdir():
-            if file_path.is_file():
-                # Validate the file path before adding to queue
-                try:
-                    safe_path = file_path.resolve()
-                    safe_path.relative_to(self.download_path)
-                    self.work_queue.put(safe_path)
-                    count += 1
-                except ValueError:
-                    logging.warning("⚠️ Skipping file outside download directory: %s", file_path)
+        # DirEntry caches the file type from the directory listing, so no extra stat per entry
+        with os.scandir(self.download_path) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False) or entry.name.startswith('.'):
                     continue
-        logging.info("✅ Queued %d existing files.", count)
\ No newline at end of file
+                if is_temporary_download(entry.name):
+                    continue  # Picked up by the watcher once the browser renames it
+                # Entries are direct, non-symlink children of the resolved download folder,
+                # so they cannot point outside it; the worker validates each path again anyway
+                if self.enqueue(Path(entry.path)):
+                    count += 1
+        logger.info("✅ Queued %d existing files.", count)
\ No newline at end of file
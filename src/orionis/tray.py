@@ -7,6 +7,11 @@ from pathlib import Path
 import pystray
 from PIL import Image
 
+NOTIFICATION_BATCH_WINDOW_SECONDS = 0.5  # Messages arriving this close together share one notification
+NOTIFICATION_BATCH_SIZE = 10
+NOTIFICATION_PREVIEW_LINES = 3
+ICON_SIZE = (64, 64)  # Largest size the tray icon is drawn at
+
 class SystemTrayIcon:
     """Class to manage the system tray icon and UI interactions."""
 
@@ -27,10 +32,14 @@ class SystemTrayIcon:
     def _create_image(self):
         """Create image object from the icon file."""
         try:
-            return Image.open(self.icon_path)
+            image = Image.open(self.icon_path)
+            # Decode only what a tray icon needs; draft() lets JPEG decode at reduced scale
+            image.draft('RGB', ICON_SIZE)
+            image.thumbnail(ICON_SIZE, Image.Resampling.LANCZOS)
+            return image
         except Exception as e:
             logging.error("❌ Error loading icon image: %s. Using default.", e)
-            return Image.new('RGB', (64, 64), color=(73, 134, 232))
+            return Image.new('RGB', ICON_SIZE, color=(73, 134, 232))
 
     def _create_menu(self):
         """Create the context menu for the system tray icon."""
@@ -52,23 +61,53 @@ class SystemTrayIcon:
         """Signal the application to exit."""
         logging.info("🛑 Exit requested from tray icon.")
         self.stop_event.set()
+        self.status_queue.put(None)  # Wake the status thread so it can exit
         self.icon.stop()
 
     def _process_status_queue(self):
         """Process messages from the status queue to show notifications."""
+        # Block until a message arrives instead of waking up every second;
+        # a None message is the signal to exit
         while not self.stop_event.is_set():
             try:
-                message = self.status_queue.get(timeout=1)
-                if message:
-                    title = message.get('title', 'Notification')
-                    text = message.get('text', '')
-                    self.show_notification(title, text)
+                message = self.status_queue.get()
                 self.status_queue.task_done()
-            except queue.Empty:
-                continue
+                if message is None:
+                    break
+
+                # Collect the rest of a burst (e.g. the startup sort) into one notification
+                batch = [message]
+                stopping = False
+                while len(batch) < NOTIFICATION_BATCH_SIZE:
+                    try:
+                        message = self.status_queue.get(timeout=NOTIFICATION_BATCH_WINDOW_SECONDS)
+                    except queue.Empty:
+                        break
+                    self.status_queue.task_done()
+                    if message is None:
+                        stopping = True
+                        break
+                    batch.append(message)
+
+                self._notify_batch(batch)
+                if stopping:
+                    break
             except Exception as e:
                 logging.error("❌ Error in status queue processing: %s", e)
 
+    def _notify_batch(self, batch: list):
+        """Show one notification for a batch of status messages."""
+        if len(batch) == 1:
+            self.show_notification(batch[0].get('title', 'Notification'), batch[0].get('text', ''))
+            return
+
+        titles = {message.get('title', 'Notification') for message in batch}
+        title = titles.pop() if len(titles) == 1 else self.app_name
+        lines = [message.get('text', '') for message in batch[:NOTIFICATION_PREVIEW_LINES]]
+        if len(batch) > NOTIFICATION_PREVIEW_LINES:
+            lines.append(f"...and {len(batch) - NOTIFICATION_PREVIEW_LINES} more.")
+        self.show_notification(f"{title} ({len(batch)})", "\n".join(lines))
+
     def show_notification(self, title: str, message: str):
         """Display a desktop notification."""
         if self.icon.visible:
@@ -83,6 +122,7 @@ class SystemTrayIcon:
     def stop(self):
         """Stop the system tray icon."""
         logging.info("🛑 Stopping system tray icon.")
+        self.status_queue.put(None)
         self.icon.stop()
         if self.status_thread.is_alive():
             self.status_thread.join(timeout=2)
@@ -0,0 +1,87 @@
+"""
+Watchdog event handler that feeds new downloads to the sorter
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from watchdog.events import FileSystemEventHandler, FileSystemMovedEvent
+
+from .sorter import is_temporary_download
+
+DEBOUNCE_SECONDS = 0.2  # Events for the same file within this window are coalesced
+DEBOUNCE_POLL_SECONDS = 0.1
+
+
+class WatcherEventHandler(FileSystemEventHandler):
+    """
+    A watchdog event handler that hands new file paths to the sorter.
+    Bursts of events for the same file are coalesced so each file is queued once,
+    and in-progress browser downloads are ignored until they get their final name.
+    """
+    def __init__(self, enqueue, download_path: Path, stop_event: threading.Event):
+        self.enqueue = enqueue  # FileSorter.enqueue, which skips paths already queued
+        self.download_path = download_path
+        # Event paths are plain strings, so compare parents as strings too
+        self._download_dir = str(download_path)
+        self.stop_event = stop_event
+        self._pending = {}  # path -> time of the latest event
+        self._pending_lock = threading.Lock()
+        self._has_pending = threading.Event()
+        self.flush_thread = threading.Thread(target=self._flush_pending, daemon=True)
+
+    def on_created(self, event):
+        if not event.is_directory and not is_temporary_download(event.src_path):
+            logging.info("📥 New file detected: %s", event.src_path)
+            self._schedule(event.src_path)
+
+    def on_moved(self, event: FileSystemMovedEvent):
+        if (not event.is_directory and os.path.dirname(event.dest_path) == self._download_dir
+                and not is_temporary_download(event.dest_path)):
+            logging.info("📥 File moved into downloads: %s", event.dest_path)
+            self._schedule(event.dest_path)
+
+    def on_closed(self, event):
+        # Only delivered by the Linux inotify backend (IN_CLOSE_WRITE): the writer has
+        # finished with the file, which is a more reliable signal than polling its size
+        if not event.is_directory and not is_temporary_download(event.src_path):
+            logging.info("📥 File finished writing: %s", event.src_path)
+            self._schedule(event.src_path)
+
+    def _schedule(self, path: str):
+        """Record an event for a file, restarting its debounce window."""
+        with self._pending_lock:
+            self._pending[path] = time.monotonic()
+            self._has_pending.set()
+
+    def _flush_pending(self):
+        """Queue files whose latest event is older than the debounce window."""
+        while True:
+            # Sleeps without waking up while nothing is pending
+            self._has_pending.wait()
+            if self.stop_event.is_set():
+                return
+            time.sleep(DEBOUNCE_POLL_SECONDS)
+            cutoff = time.monotonic() - DEBOUNCE_SECONDS
+            with self._pending_lock:
+                ready = [path for path, seen in self._pending.items() if seen <= cutoff]
+                for path in ready:
+                    del self._pending[path]
+                if not self._pending:
+                    self._has_pending.clear()
+            # Repeats of a path that is still queued or being sorted are filtered
+            # by the sorter, so a new file that reuses a name is always queued
+            for path in ready:
+                self.enqueue(Path(path))
+
+    def start(self):
+        """Start the thread that hands debounced files to the work queue."""
+        self.flush_thread.start()
+
+    def stop(self):
+        """Stop the debounce thread; stop_event must already be set."""
+        self._has_pending.set()
+        if self.flush_thread.is_alive():
+            self.flush_thread.join(timeout=2)
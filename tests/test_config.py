@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+import pytest
+
+# Add the src directory to the Python path to allow imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from orionis import config as config_module
+from orionis.config import DEFAULT_FILE_CATEGORIES, load_configuration
+
+
+def test_load_configuration_reads_utf8_with_bom(tmp_path):
+    """Test that a config saved with a UTF-8 BOM loads and is normalized."""
+    config_path = tmp_path / "config.json"
+    config_path.write_bytes(b'\xef\xbb\xbf{"file_categories": {"Images": [".JPG"]}}')
+
+    assert load_configuration(config_path) == {'Images': frozenset({'.jpg'})}
+
+def test_load_configuration_falls_back_on_non_utf8(tmp_path, monkeypatch):
+    """Test that a config saved in a legacy encoding falls back to the defaults instead of crashing."""
+    # The stdlib parser raises UnicodeDecodeError here, unlike orjson
+    monkeypatch.setattr(config_module, "_json_loads", json.loads)
+    config_path = tmp_path / "config.json"
+    config_path.write_bytes('{"file_categories": {"Müsik": [".mp3"]}}'.encode('cp1252'))
+
+    assert load_configuration(config_path) == DEFAULT_FILE_CATEGORIES
+
+@pytest.mark.parametrize("content", [
+    '[1, 2]',
+    '{"file_categories": []}',
+    '{"file_categories": {"Images": [".jpg", 5]}}',
+    '{"file_categories": {"Images": ".jpg"}}',
+])
+def test_load_configuration_falls_back_on_wrong_shape(tmp_path, content):
+    """Test that valid JSON of the wrong shape falls back to the defaults instead of crashing."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(content)
+
+    assert load_configuration(config_path) == DEFAULT_FILE_CATEGORIES
@@ -0,0 +1,53 @@
+import queue
+import threading
+import time
+from pathlib import Path
+import pytest
+
+# Add the src directory to the Python path to allow imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from orionis.queues import LightQueue
+
+
+def test_light_queue_fifo_order():
+    """Test that items come out in the order they were put in."""
+    work_queue = LightQueue()
+    for item in range(3):
+        work_queue.put(item)
+
+    assert work_queue.qsize() == 3
+    assert [work_queue.get_nowait() for _ in range(3)] == [0, 1, 2]
+    assert work_queue.empty()
+
+def test_light_queue_empty_raises():
+    """Test that non-blocking and timed-out gets raise queue.Empty like queue.Queue."""
+    work_queue = LightQueue()
+
+    with pytest.raises(queue.Empty):
+        work_queue.get_nowait()
+    with pytest.raises(queue.Empty):
+        work_queue.get(timeout=0.05)
+
+def test_light_queue_wakes_blocked_consumers():
+    """Test that consumers blocked in get() receive items put from another thread."""
+    work_queue = LightQueue()
+    received = []
+    lock = threading.Lock()
+
+    def consume():
+        item = work_queue.get(timeout=2)
+        with lock:
+            received.append(item)
+
+    consumers = [threading.Thread(target=consume) for _ in range(4)]
+    for consumer in consumers:
+        consumer.start()
+    time.sleep(0.05)  # Let every consumer block on the empty queue
+    for item in range(4):
+        work_queue.put(item)
+    for consumer in consumers:
+        consumer.join(timeout=3)
+
+    assert sorted(received) == [0, 1, 2, 3]
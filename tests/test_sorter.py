@@ -1,5 +1,9 @@
+import errno
+import os
 import queue
+import stat
 import threading
+from types import SimpleNamespace
 from pathlib import Path
 import pytest
 from pyfakefs.fake_filesystem import FakeFilesystem
@@ -8,7 +12,8 @@ from pyfakefs.fake_filesystem import FakeFilesystem
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from orionis.sorter import SortWorker, FileSorter, safe_path_join
+from orionis import sorter as sorter_module
+from orionis.sorter import SortWorker, FileSorter, DestinationIndex, InFlightFiles, safe_path_join, move_file
 
 # --- Test Data and Fixtures ---
 
@@ -33,7 +38,7 @@ def downloads_path(fs: FakeFilesystem, file_categories):
 
 # --- Unit Tests for Helper Functions ---
 
-def test_safe_path_join(downloads_path):
+def test_safe_path_join(downloads_path, fs: FakeFilesystem):
     """Test the safe_path_join function for both valid and invalid paths."""
     # Valid case
     valid_path = safe_path_join(downloads_path, "Images", "test.jpg")
@@ -43,6 +48,18 @@ def test_safe_path_join(downloads_path):
     with pytest.raises(ValueError, match="Path traversal detected"):
         safe_path_join(downloads_path, "..", "some_other_folder")
 
+    # A plain name that is a symlink out of the base is still caught
+    fs.create_symlink(downloads_path / "Escape", Path.home())
+    with pytest.raises(ValueError, match="Path traversal detected"):
+        safe_path_join(downloads_path, "Escape")
+
+def test_is_link_detects_windows_junction(downloads_path, monkeypatch):
+    """Test that a directory reparse point (an NTFS junction) is treated as a link."""
+    junction_stat = SimpleNamespace(st_mode=stat.S_IFDIR, st_file_attributes=stat.FILE_ATTRIBUTE_REPARSE_POINT)
+    monkeypatch.setattr(sorter_module.os, "lstat", lambda path: junction_stat)
+
+    assert sorter_module._is_link(downloads_path / "Images")
+
 def test_get_file_category(file_categories):
     """Test the _get_file_category method."""
     # A dummy worker instance to test the private method
@@ -75,10 +92,57 @@ def test_get_unique_destination(downloads_path, fs: FakeFilesystem):
     duplicate_path_2 = worker._get_unique_destination(images_path, "existing_file.jpg")
     assert duplicate_path_2 == images_path / "existing_file_2.jpg"
 
+    # Numbering continues after the highest existing copy instead of filling gaps from 1
+    fs.create_file(images_path / "report.pdf")
+    fs.create_file(images_path / "report_7.pdf")
+    # A fresh worker scans the folder, so it sees the copies created above
+    worker = SortWorker(queue.Queue(), queue.Queue(), downloads_path, {}, threading.Event())
+    assert worker._get_unique_destination(images_path, "report.pdf") == images_path / "report_8.pdf"
+    assert worker._get_unique_destination(images_path, "report.pdf") == images_path / "report_9.pdf"
+
     # Test for path traversal in filename
     with pytest.raises(ValueError, match="Invalid filename detected"):
         worker._get_unique_destination(images_path, "../traversal.txt")
 
+def test_destination_index_shared_between_workers(downloads_path, fs: FakeFilesystem):
+    """Test that workers sharing a DestinationIndex never hand out the same name twice."""
+    images_path = downloads_path / "Images"
+    fs.create_file(images_path / "photo.jpg")
+
+    index = DestinationIndex()
+    worker_a = SortWorker(queue.Queue(), queue.Queue(), downloads_path, {}, threading.Event(), index)
+    worker_b = SortWorker(queue.Queue(), queue.Queue(), downloads_path, {}, threading.Event(), index)
+
+    # Neither name is on disk yet, but the first reservation must block the second
+    assert worker_a._get_unique_destination(images_path, "photo.jpg") == images_path / "photo_1.jpg"
+    assert worker_b._get_unique_destination(images_path, "photo.jpg") == images_path / "photo_2.jpg"
+
+def test_destination_index_bounds_name_counters(downloads_path, fs: FakeFilesystem, monkeypatch):
+    """Test that only the most recently used numbering counters are kept."""
+    monkeypatch.setattr(sorter_module, "MAX_NAME_COUNTERS", 2)
+    images_path = downloads_path / "Images"
+    index = DestinationIndex()
+    for stem in ("a", "b", "c"):
+        fs.create_file(images_path / f"{stem}.jpg")
+        assert index.reserve(images_path, f"{stem}.jpg", stem, ".jpg") == f"{stem}_1.jpg"
+
+    # The oldest counter was dropped; the name set still continues the numbering
+    assert len(index._counters) == 2
+    assert index.reserve(images_path, "a.jpg", "a", ".jpg") == "a_2.jpg"
+
+def test_destination_index_placeholder(downloads_path, fs: FakeFilesystem):
+    """Test that a placeholder reservation claims the name on disk and skips taken names."""
+    images_path = downloads_path / "Images"
+    index = DestinationIndex()
+    index.reserve(images_path, "other.png", "other", ".png")  # Scan the folder first
+
+    # Created behind the index's back, so only the O_EXCL open can notice it
+    fs.create_file(images_path / "scan.png")
+    name = index.reserve(images_path, "scan.png", "scan", ".png", create_placeholder=True)
+
+    assert name == "scan_1.png"
+    assert (images_path / "scan_1.png").stat().st_size == 0
+
 
 # --- Integration-style Tests for Worker and Sorter ---
 
@@ -108,6 +172,44 @@ def test_sort_worker_process_file(downloads_path, file_categories, fs: FakeFiles
     assert "my_image.jpg" in status_message['text']
     assert "Images" in status_message['text']
 
+def test_sort_worker_reuses_name_of_deleted_file(downloads_path, file_categories, fs: FakeFilesystem):
+    """Test that a name freed by deleting a sorted file is used again instead of numbered."""
+    worker = SortWorker(queue.Queue(), queue.Queue(), downloads_path, file_categories, threading.Event())
+    fs.create_file(downloads_path / "photo.jpg", contents="first")
+    worker._process_file(downloads_path / "photo.jpg")
+
+    (downloads_path / "Images" / "photo.jpg").unlink()
+    fs.create_file(downloads_path / "photo.jpg", contents="second")
+    worker._process_file(downloads_path / "photo.jpg")
+
+    assert (downloads_path / "Images" / "photo.jpg").read_text() == "second"
+    assert not (downloads_path / "Images" / "photo_1.jpg").exists()
+
+def test_sort_worker_recreates_removed_category_folder(downloads_path, file_categories, fs: FakeFilesystem):
+    """Test that a category folder deleted after the worker first used it is created again."""
+    worker = SortWorker(queue.Queue(), queue.Queue(), downloads_path, file_categories, threading.Event())
+    fs.create_file(downloads_path / "first.pdf", contents="first")
+    worker._process_file(downloads_path / "first.pdf")
+
+    fs.remove_object(str(downloads_path / "Documents"))
+    fs.create_file(downloads_path / "second.pdf", contents="second")
+    worker._process_file(downloads_path / "second.pdf")
+
+    assert (downloads_path / "Documents" / "second.pdf").exists()
+
+def test_wait_for_file_completion_rejects_empty_file(downloads_path, fs: FakeFilesystem, monkeypatch):
+    """Test that an empty file, like a browser's final-name placeholder, is never treated as finished."""
+    monkeypatch.setattr(sorter_module, "STABLE_FILE_TIMEOUT_SECONDS", 0.2)
+    empty_file = downloads_path / "setup.exe"
+    fs.create_file(empty_file)
+    worker = SortWorker(queue.Queue(), queue.Queue(), downloads_path, {}, threading.Event())
+
+    assert not worker._wait_for_file_completion(empty_file)
+
+    # Even an old empty file does not take the idle-file shortcut
+    os.utime(empty_file, (0, 0))
+    assert not worker._wait_for_file_completion(empty_file)
+
 def test_sort_worker_ignores_file_outside_downloads(downloads_path, file_categories, fs: FakeFilesystem, caplog):
     """Test that the worker ignores and logs a file outside the monitored directory."""
     work_queue = queue.Queue()
@@ -133,6 +235,8 @@ def test_file_sorter_sort_existing_files(downloads_path, file_categories, fs: Fa
     fs.create_file(downloads_path / "document.pdf")
     fs.create_file(downloads_path / "archive.zip")
     fs.create_dir(downloads_path / "an_existing_folder") # Should be ignored
+    fs.create_file(downloads_path / ".DS_Store") # Hidden files should be ignored too
+    fs.create_file(downloads_path / "movie.mp4.crdownload") # In-progress downloads as well
 
     sorter = FileSorter(work_queue, queue.Queue(), downloads_path, file_categories, threading.Event())
     sorter.sort_existing_files()
@@ -141,4 +245,138 @@ def test_file_sorter_sort_existing_files(downloads_path, file_categories, fs: Fa
     
     # Check that the files are in the queue
     queued_files = {work_queue.get_nowait().name for _ in range(3)}
-    assert queued_files == {"image.png", "document.pdf", "archive.zip"}
\ No newline at end of file
+    assert queued_files == {"image.png", "document.pdf", "archive.zip"}
+
+def test_file_sorter_enqueue_skips_queued_duplicates(downloads_path, file_categories, fs: FakeFilesystem):
+    """Test that a path already waiting in the queue is not queued a second time."""
+    work_queue = queue.Queue()
+    fs.create_file(downloads_path / "image.png")
+
+    sorter = FileSorter(work_queue, queue.Queue(), downloads_path, file_categories, threading.Event())
+    sorter.sort_existing_files()
+
+    # The watcher reporting the same file again must not add a second entry
+    assert not sorter.enqueue(downloads_path / "image.png")
+    assert work_queue.qsize() == 1
+
+def test_file_sorter_create_category_folders(downloads_path, file_categories, fs: FakeFilesystem):
+    """Test that only missing category folders are created."""
+    fs.remove_object(str(downloads_path / "Archives"))
+    fs.create_file(downloads_path / "Images" / "kept.jpg")
+
+    sorter = FileSorter(queue.Queue(), queue.Queue(), downloads_path, file_categories, threading.Event())
+    sorter._create_category_folders()
+
+    for category in file_categories:
+        assert (downloads_path / category).is_dir()
+    assert (downloads_path / "Images" / "kept.jpg").exists()
+
+def test_sort_worker_skips_file_in_flight(downloads_path, file_categories, fs: FakeFilesystem):
+    """Test that a file already claimed by another worker is not processed twice."""
+    test_file_path = downloads_path / "report.pdf"
+    fs.create_file(test_file_path, contents="fake pdf data")
+
+    in_flight = InFlightFiles()
+    worker = SortWorker(queue.Queue(), queue.Queue(), downloads_path, file_categories, threading.Event(), in_flight=in_flight)
+
+    # Claims are keyed by file identity, not by path
+    file_stat = os.stat(test_file_path)
+    key = (file_stat.st_dev, file_stat.st_ino)
+
+    assert in_flight.acquire(key)
+    worker._process_file(test_file_path)
+    assert test_file_path.exists()
+
+    in_flight.release(key)
+    worker._process_file(test_file_path)
+    assert (downloads_path / "Documents" / "report.pdf").exists()
+
+# --- Tests for Cross-Device Moves ---
+# These use the real filesystem: os.replace is made to fail with EXDEV to force the copy path
+
+def _raise_exdev(source, destination):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+@pytest.fixture
+def move_paths(tmp_path):
+    """Returns a source file with known content and a free destination path."""
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"0123456789" * 1000)
+    return source, tmp_path / "destination.bin"
+
+@pytest.mark.skipif(not hasattr(os, 'copy_file_range'), reason="copy_file_range is Linux-only")
+def test_move_file_across_devices_uses_copy_file_range(move_paths, monkeypatch):
+    """Test that a cross-device move copies the data in the kernel and removes the source."""
+    source, destination = move_paths
+    monkeypatch.setattr(sorter_module.os, "replace", _raise_exdev)
+
+    move_file(str(source), str(destination))
+
+    assert destination.read_bytes() == b"0123456789" * 1000
+    assert not source.exists()
+
+@pytest.mark.parametrize("error", [errno.ENOSYS, errno.EXDEV, errno.EPERM])
+def test_move_file_falls_back_when_copy_file_range_unsupported(move_paths, monkeypatch, error):
+    """Test that copy_file_range errors meaning 'not possible here' fall back to shutil.copyfile."""
+    source, destination = move_paths
+    monkeypatch.setattr(sorter_module.os, "replace", _raise_exdev)
+
+    def unsupported(*args):
+        raise OSError(error, os.strerror(error))
+    monkeypatch.setattr(sorter_module.os, "copy_file_range", unsupported, raising=False)
+
+    move_file(str(source), str(destination))
+
+    assert destination.read_bytes() == b"0123456789" * 1000
+    assert not source.exists()
+
+@pytest.mark.skipif(not hasattr(os, 'copy_file_range'), reason="copy_file_range is Linux-only")
+def test_move_file_does_not_fall_back_after_partial_copy(move_paths, monkeypatch):
+    """Test that an error after some data was copied is raised instead of starting a second copy."""
+    source, destination = move_paths
+    monkeypatch.setattr(sorter_module.os, "replace", _raise_exdev)
+    real_copy_file_range = os.copy_file_range
+    calls = []
+
+    def fails_after_first_chunk(src, dst, count, *args):
+        if calls:
+            raise OSError(errno.ENOSYS, os.strerror(errno.ENOSYS))
+        calls.append(count)
+        return real_copy_file_range(src, dst, 10)
+    monkeypatch.setattr(sorter_module.os, "copy_file_range", fails_after_first_chunk)
+    monkeypatch.setattr(sorter_module.shutil, "copyfile", lambda *args: pytest.fail("fell back to copyfile"))
+
+    with pytest.raises(OSError):
+        move_file(str(source), str(destination))
+
+def test_move_file_reraises_other_errors_without_copying(move_paths, monkeypatch):
+    """Test that an os.replace error other than EXDEV is raised as is and nothing is copied."""
+    source, destination = move_paths
+
+    def permission_denied(source, destination):
+        raise PermissionError(errno.EACCES, "Permission denied")
+    monkeypatch.setattr(sorter_module.os, "replace", permission_denied)
+    monkeypatch.setattr(sorter_module, "_copy_file", lambda *args: pytest.fail("copied after a non-EXDEV error"))
+
+    with pytest.raises(PermissionError):
+        move_file(str(source), str(destination))
+
+    assert source.exists()
+    assert not destination.exists()
+
+def test_move_file_failed_copy_removes_destination(move_paths, monkeypatch):
+    """Test that a copy failing halfway leaves no partial destination and keeps the source."""
+    source, destination = move_paths
+    monkeypatch.setattr(sorter_module.os, "replace", _raise_exdev)
+
+    def copy_half_then_fail(src, dst):
+        with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+            dst_file.write(src_file.read(100))
+        raise OSError(errno.EIO, "Input/output error")
+    monkeypatch.setattr(sorter_module, "_copy_file", copy_half_then_fail)
+
+    with pytest.raises(OSError):
+        move_file(str(source), str(destination))
+
+    assert source.read_bytes() == b"0123456789" * 1000
+    assert not destination.exists()
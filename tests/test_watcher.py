@@ -0,0 +1,55 @@
+import threading
+import time
+from pathlib import Path
+
+# Add the src directory to the Python path to allow imports
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from orionis.watcher import WatcherEventHandler, DEBOUNCE_SECONDS, DEBOUNCE_POLL_SECONDS
+
+# Long enough for one debounce window plus a poll of the flush thread
+FLUSH_WAIT_SECONDS = DEBOUNCE_SECONDS + DEBOUNCE_POLL_SECONDS * 3
+
+
+def test_watcher_queues_new_file_reusing_a_name(tmp_path):
+    """Test that a second download with the name of an already sorted file is queued too."""
+    queued = []
+    stop_event = threading.Event()
+    handler = WatcherEventHandler(queued.append, tmp_path, stop_event)
+    handler.start()
+    try:
+        # The first invoice.pdf is queued and then moved away by the sorter
+        first = tmp_path / "invoice.pdf"
+        first.write_bytes(b"first")
+        handler._schedule(str(first))
+        time.sleep(FLUSH_WAIT_SECONDS)
+        first.unlink()
+
+        # The browser reuses the freed name for the next download
+        second = tmp_path / "invoice.pdf"
+        second.write_bytes(b"second")
+        handler._schedule(str(second))
+        time.sleep(FLUSH_WAIT_SECONDS)
+    finally:
+        stop_event.set()
+        handler.stop()
+
+    assert queued == [first, second]
+
+def test_watcher_coalesces_event_bursts(tmp_path):
+    """Test that several events for one file within the debounce window queue it once."""
+    queued = []
+    stop_event = threading.Event()
+    handler = WatcherEventHandler(queued.append, tmp_path, stop_event)
+    handler.start()
+    try:
+        path = tmp_path / "photo.jpg"
+        for _ in range(3):
+            handler._schedule(str(path))
+        time.sleep(FLUSH_WAIT_SECONDS)
+    finally:
+        stop_event.set()
+        handler.stop()
+
+    assert queued == [path]